@@ -1,34 +1,66 @@
 import os
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
 
-load_dotenv()
+@functools.cache
+def _load_env_once() -> bool:
+    """Parse .env into the process environment, at most once per process"""
+    load_dotenv()
+    return True
+
+@functools.cache
+def _env(name: str, default=None):
+    """Cached environment lookup (populated after .env has been loaded)"""
+    _load_env_once()
+    return os.getenv(name, default)
+
+_load_env_once()
 
 class Config:
-    SMARTSHEET_API_TOKEN = os.getenv('SMARTSHEET_API_TOKEN')
-    WORKSPACE_ID = os.getenv('WORKSPACE_ID')
+    SMARTSHEET_API_TOKEN = _env('SMARTSHEET_API_TOKEN')
+    WORKSPACE_ID = _env('WORKSPACE_ID')
     
     PROJECT_ROOT = Path(__file__).parent.parent
     DATA_DIR = PROJECT_ROOT / 'data'
     SHEETS_DIR = DATA_DIR / 'sheets'
     
     WORKSPACE_META_FILE = DATA_DIR / 'workspace_meta.json'
-    SYNC_HISTORY_FILE = DATA_DIR / 'sync_history.json'
+    SYNC_HISTORY_FILE = DATA_DIR / 'sync_history.jsonl'
+    LEGACY_SYNC_HISTORY_FILE = DATA_DIR / 'sync_history.json'
+    SYNC_HISTORY_LIMIT = 50
+    SYNC_HISTORY_TRIM_BYTES = 1024 * 1024
     
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+    LOG_LEVEL = _env('LOG_LEVEL', 'INFO')
     LOG_FILE = PROJECT_ROOT / 'smartsheet_sync.log'
     
-    REQUEST_TIMEOUT = int(os.getenv('REQUEST_TIMEOUT', '30'))
-    MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
+    REQUEST_TIMEOUT = int(_env('REQUEST_TIMEOUT', '30'))
+    MAX_RETRIES = int(_env('MAX_RETRIES', '3'))
+    # Fetched sheets allowed to wait for the storage writer during a full sync
+    STORE_QUEUE_SIZE = max(1, int(_env('STORE_QUEUE_SIZE', '4')))
+    # Worker processes that encode and write large sheets during a full sync (0 = save inline).
+    # Pickling a sheet to a worker costs more than orjson's inline encode, so
+    # this only pays off with the stdlib json fallback on multi-core hosts
+    SAVE_PROCESSES = max(0, int(_env('SAVE_PROCESSES', '0')))
+    # Sheets with fewer rows are always saved inline
+    SAVE_PROCESS_MIN_ROWS = int(_env('SAVE_PROCESS_MIN_ROWS', '5000'))
+    # Rows requested per page when downloading a sheet (0 = whole sheet in one request)
+    SHEET_PAGE_SIZE = max(0, int(_env('SHEET_PAGE_SIZE', '500')))
+    # Parse sheet responses incrementally as they download (requires ijson)
+    STREAM_SHEETS = _env('STREAM_SHEETS', 'false').lower() == 'true'
+    HTTP_POOL_SIZE = max(1, int(_env('HTTP_POOL_SIZE', '32')))
+    FETCH_CONCURRENCY = max(1, int(_env('FETCH_CONCURRENCY', '8')))
+    # 'threads' (default), 'async' (requires aiohttp) or 'http2' (requires httpx[http2])
+    FETCH_BACKEND = _env('FETCH_BACKEND', 'threads').strip().lower()
     
-    SSL_VERIFY = os.getenv('SSL_VERIFY', 'true').lower() == 'true'
-    SSL_CERT_PATH = os.getenv('SSL_CERT_PATH')
-    SSL_CA_BUNDLE = os.getenv('SSL_CA_BUNDLE')
+    SSL_VERIFY = _env('SSL_VERIFY', 'true').lower() == 'true'
+    SSL_CERT_PATH = _env('SSL_CERT_PATH')
+    SSL_CA_BUNDLE = _env('SSL_CA_BUNDLE')
     
-    PROXY_HTTP = os.getenv('PROXY_HTTP')
-    PROXY_HTTPS = os.getenv('PROXY_HTTPS')
+    PROXY_HTTP = _env('PROXY_HTTP')
+    PROXY_HTTPS = _env('PROXY_HTTPS')
 
-    _SECURITY_MODE_ENV = os.getenv('SECURITY_MODE', 'enterprise').strip().lower()
+    _SECURITY_MODE_ENV = _env('SECURITY_MODE', 'enterprise').strip().lower()
     SECURITY_MODE = _SECURITY_MODE_ENV if _SECURITY_MODE_ENV in {'enterprise', 'testing'} else 'enterprise'
 
     @classmethod
@@ -39,6 +71,8 @@ class Config:
     @classmethod
     def validate(cls):
         """Validate required configuration"""
+        _load_env_once()
+        
         if not cls.SMARTSHEET_API_TOKEN:
             raise ValueError("SMARTSHEET_API_TOKEN is required")
         
@@ -52,3 +86,8 @@ class Config:
     def get_sheet_file_path(cls, sheet_id):
         """Get file path for a specific sheet"""
         return cls.SHEETS_DIR / f"sheet_{sheet_id}.json"
+    
+    @classmethod
+    def get_sheet_meta_file_path(cls, sheet_id):
+        """Get metadata sidecar file path for a specific sheet"""
+        return cls.SHEETS_DIR / f"sheet_{sheet_id}.meta.json"
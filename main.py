@@ -8,39 +8,28 @@ import sys
 import argparse
 import json
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 # Add project root to Python path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.sync_manager import SyncManager
-from utils.logger import setup_logger
 from config.settings import Config
 
-logger = setup_logger(__name__)
+if TYPE_CHECKING:
+    from src.sync_manager import SyncManager
 
-def main():
-    parser = argparse.ArgumentParser(
-        description='Sync Smartsheet workspace data to JSON files',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-Examples:
-  python main.py sync                    # Full sync of all sheets
-  python main.py sync --sheets 123 456  # Sync specific sheet IDs
-  python main.py status                  # Show current status
-  python main.py validate               # Test connection
-  python main.py cleanup --keep 5       # Clean up old files
-        """
-    )
-    parser.add_argument(
-        '--security-mode',
-        choices=['enterprise', 'testing'],
-        default=Config.SECURITY_MODE,
-        help="Toggle enterprise SSL and proxy enforcement. Use 'testing' to relax checks for local testing."
-    )
-    
-    subparsers = parser.add_subparsers(dest='command', help='Available commands')
-    
-    # Sync command
+_logger = None
+
+def _log():
+    """Return the module logger, creating it on first use"""
+    global _logger
+    if _logger is None:
+        from utils.logger import setup_logger
+        _logger = setup_logger(__name__)
+    return _logger
+
+def _build_sync_parser(subparsers):
+    """Register the sync command"""
     sync_parser = subparsers.add_parser('sync', help='Synchronize data from Smartsheet')
     sync_parser.add_argument(
         '--sheets', 
@@ -54,8 +43,14 @@ Examples:
         default='summary',
         help='Output format (default: summary)'
     )
-    
-    # Status command
+    sync_parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Re-download every sheet, ignoring stored versions'
+    )
+
+def _build_status_parser(subparsers):
+    """Register the status command"""
     status_parser = subparsers.add_parser('status', help='Show current data status')
     status_parser.add_argument(
         '--format', 
@@ -63,11 +58,13 @@ Examples:
         default='table',
         help='Output format (default: table)'
     )
-    
-    # Validate command
-    validate_parser = subparsers.add_parser('validate', help='Validate Smartsheet connection')
-    
-    # Cleanup command
+
+def _build_validate_parser(subparsers):
+    """Register the validate command"""
+    subparsers.add_parser('validate', help='Validate Smartsheet connection')
+
+def _build_cleanup_parser(subparsers):
+    """Register the cleanup command"""
     cleanup_parser = subparsers.add_parser('cleanup', help='Clean up old data files')
     cleanup_parser.add_argument(
         '--keep', 
@@ -75,6 +72,52 @@ Examples:
         default=10,
         help='Number of latest files to keep (default: 10)'
     )
+
+_BUILDERS = {
+    'sync': _build_sync_parser,
+    'status': _build_status_parser,
+    'validate': _build_validate_parser,
+    'cleanup': _build_cleanup_parser,
+}
+
+def _sniff_subcommand(argv):
+    """Return the first known command in argv, or None if there isn't one"""
+    for token in argv[1:]:
+        if token.startswith('-'):
+            continue
+        if token in _BUILDERS:
+            return token
+    return None
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Sync Smartsheet workspace data to JSON files',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python main.py sync                    # Full sync of all sheets
+  python main.py sync --sheets 123 456  # Sync specific sheet IDs
+  python main.py status                  # Show current status
+  python main.py validate               # Test connection
+  python main.py cleanup --keep 5       # Clean up old files
+        """
+    )
+    parser.add_argument(
+        '--security-mode',
+        choices=['enterprise', 'testing'],
+        default=Config.SECURITY_MODE,
+        help="Toggle enterprise SSL and proxy enforcement. Use 'testing' to relax checks for local testing."
+    )
+    
+    subparsers = parser.add_subparsers(dest='command', help='Available commands')
+    
+    command = _sniff_subcommand(sys.argv)
+    if command:
+        _BUILDERS[command](subparsers)
+    else:
+        # No recognizable command (e.g. --help): build all for full usage
+        for build in _BUILDERS.values():
+            build(subparsers)
     
     args = parser.parse_args()
     
@@ -82,6 +125,9 @@ Examples:
         parser.print_help()
         return
     
+    # Deferred so --help and argument errors skip the Smartsheet SDK import
+    from src.sync_manager import SyncManager
+    
     try:
         # Validate configuration
         Config.validate()
@@ -102,11 +148,11 @@ Examples:
             handle_cleanup_command(sync_manager, args)
             
     except Exception as e:
-        logger.error(f"Command failed: {e}")
+        _log().error("Command failed: %s", e)
         print(f"Error: {e}")
         sys.exit(1)
 
-def handle_sync_command(sync_manager: SyncManager, args):
+def handle_sync_command(sync_manager: "SyncManager", args):
     """Handle sync command"""
     try:
         if args.sheets:
@@ -114,7 +160,7 @@ def handle_sync_command(sync_manager: SyncManager, args):
             result = sync_manager.sync_specific_sheets(args.sheets)
         else:
             print("Starting full workspace sync...")
-            result = sync_manager.full_sync()
+            result = sync_manager.full_sync(force_refresh=args.refresh)
         
         if args.output == 'json':
             print(json.dumps(result, indent=2))
@@ -122,11 +168,11 @@ def handle_sync_command(sync_manager: SyncManager, args):
             print_sync_summary(result)
             
     except Exception as e:
-        logger.error(f"Sync failed: {e}")
+        _log().error("Sync failed: %s", e)
         print(f"Sync failed: {e}")
         sys.exit(1)
 
-def handle_status_command(sync_manager: SyncManager, args):
+def handle_status_command(sync_manager: "SyncManager", args):
     """Handle status command"""
     try:
         status = sync_manager.get_status()
@@ -137,11 +183,11 @@ def handle_status_command(sync_manager: SyncManager, args):
             print_status_table(status)
             
     except Exception as e:
-        logger.error(f"Status check failed: {e}")
+        _log().error("Status check failed: %s", e)
         print(f"Status check failed: {e}")
         sys.exit(1)
 
-def handle_validate_command(sync_manager: SyncManager):
+def handle_validate_command(sync_manager: "SyncManager"):
     """Handle validate command"""
     try:
         print("Validating Smartsheet connection...")
@@ -157,11 +203,11 @@ def handle_validate_command(sync_manager: SyncManager):
             sys.exit(1)
             
     except Exception as e:
-        logger.error(f"Validation failed: {e}")
+        _log().error("Validation failed: %s", e)
         print(f"Validation failed: {e}")
         sys.exit(1)
 
-def handle_cleanup_command(sync_manager: SyncManager, args):
+def handle_cleanup_command(sync_manager: "SyncManager", args):
     """Handle cleanup command"""
     try:
         result = sync_manager.cleanup_old_data(args.keep)
@@ -173,7 +219,7 @@ def handle_cleanup_command(sync_manager: SyncManager, args):
             sys.exit(1)
             
     except Exception as e:
-        logger.error(f"Cleanup failed: {e}")
+        _log().error("Cleanup failed: %s", e)
         print(f"Cleanup failed: {e}")
         sys.exit(1)
 
@@ -188,15 +234,19 @@ def print_sync_summary(result):
     print(f"Total sheets: {result.get('total_sheets', len(result.get('sheet_results', [])))}")
     print(f"Successful: {result['successful_sheets']}")
     print(f"Failed: {result['failed_sheets']}")
+    if result.get('unchanged_sheets'):
+        print(f"Unchanged: {result['unchanged_sheets']}")
     
     if result.get('sheet_results'):
         print(f"\nSheet Details:")
         for sheet in result['sheet_results']:
-            status_icon = "✓" if sheet['status'] == 'success' else "✗"
+            status_icon = "✓" if sheet['status'] in ('success', 'unchanged') else "✗"
             name = sheet.get('sheet_name', f"ID {sheet['sheet_id']}")
             if sheet['status'] == 'success':
                 rows = sheet.get('row_count', 'Unknown')
                 print(f"  {status_icon} {name} ({rows} rows)")
+            elif sheet['status'] == 'unchanged':
+                print(f"  {status_icon} {name} (unchanged)")
             else:
                 print(f"  {status_icon} {name} - {sheet.get('error', 'Unknown error')}")
     
@@ -231,7 +281,11 @@ def print_status_table(status):
         print(f"  Status: {last_sync.get('status', 'Unknown')}")
         print(f"  Time: {last_sync.get('start_time', 'Unknown')}")
         print(f"  Duration: {last_sync.get('duration_seconds', 0)}s")
-        print(f"  Success rate: {last_sync.get('successful_sheets', 0)}/{last_sync.get('total_sheets', 0)}")
+        # Unchanged sheets weren't downloaded, so they are left out of the rate
+        unchanged = last_sync.get('unchanged_sheets', 0)
+        print(f"  Success rate: {last_sync.get('successful_sheets', 0)}/{last_sync.get('total_sheets', 0) - unchanged}")
+        if unchanged:
+            print(f"  Unchanged: {unchanged}")
     
     print(f"Total syncs: {status.get('total_syncs', 0)}")
 
@@ -1,12 +1,56 @@
-import json
+import mmap
+import os
 import time
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from config.settings import Config
 from utils.logger import setup_logger
+from utils import json_codec
 
 logger = setup_logger(__name__)
 
+def _atomic_write(file_path: Path, data: bytes, durable: bool = True) -> None:
+    """Write to a temp file and rename over the target so readers never see a torn file
+    
+    With durable=True the temp file's data is fsynced before the rename, so
+    after a power loss the target holds either the old or the new contents.
+    Files that can be rebuilt (metadata sidecars) skip that fsync.
+    """
+    tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+def _write_sheet_files(file_path: Path, meta_path: Path, sheet_data: Dict[str, Any]) -> None:
+    """Encode and write a sheet file and its metadata sidecar
+    
+    Module level so it can run in a worker process; paths are passed in rather
+    than read from Config there.
+    """
+    # Sheet payloads are machine-read, so skip indentation
+    _atomic_write(file_path, json_codec.dumps(sheet_data, pretty=False))
+    # Small sidecar so summaries don't have to parse every row; it can be
+    # rebuilt from the sheet file, so it isn't fsynced
+    if 'metadata' in sheet_data:
+        _atomic_write(meta_path, json_codec.dumps(sheet_data['metadata']), durable=False)
+
+# Files at least this large are parsed straight from a memory map
+MMAP_THRESHOLD_BYTES = 256 * 1024
+
+def _load_file(file_path: Path) -> Any:
+    """Parse a JSON file, memory-mapping large files to avoid a full bytes copy"""
+    if not json_codec.HAS_ORJSON or file_path.stat().st_size < MMAP_THRESHOLD_BYTES:
+        return json_codec.loads(file_path.read_bytes())
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return json_codec.loads(view)
+
 class JSONStorage:
     def __init__(self):
         Config.validate()
@@ -14,99 +58,247 @@ class JSONStorage:
     def save_workspace_metadata(self, workspace_data: Dict[str, Any]) -> None:
         """Save workspace metadata to JSON file"""
         try:
-            with open(Config.WORKSPACE_META_FILE, 'w', encoding='utf-8') as f:
-                json.dump(workspace_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved workspace metadata to {Config.WORKSPACE_META_FILE}")
+            _atomic_write(Config.WORKSPACE_META_FILE, json_codec.dumps(workspace_data))
+            logger.info("Saved workspace metadata to %s", Config.WORKSPACE_META_FILE)
         except Exception as e:
-            logger.error(f"Error saving workspace metadata: {e}")
+            logger.error("Error saving workspace metadata: %s", e)
             raise
     
     def load_workspace_metadata(self) -> Optional[Dict[str, Any]]:
         """Load workspace metadata from JSON file"""
         try:
             if Config.WORKSPACE_META_FILE.exists():
-                with open(Config.WORKSPACE_META_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                data = json_codec.loads(Config.WORKSPACE_META_FILE.read_bytes())
                 logger.info("Loaded workspace metadata")
                 return data
             else:
                 logger.info("No workspace metadata file found")
                 return None
         except Exception as e:
-            logger.error(f"Error loading workspace metadata: {e}")
+            logger.error("Error loading workspace metadata: %s", e)
             return None
     
     def save_sheet_data(self, sheet_id: int, sheet_data: Dict[str, Any]) -> None:
         """Save individual sheet data to JSON file"""
         try:
             file_path = Config.get_sheet_file_path(sheet_id)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(sheet_data, f, indent=2, ensure_ascii=False)
-            logger.info(f"Saved sheet data to {file_path}")
+            _write_sheet_files(file_path, Config.get_sheet_meta_file_path(sheet_id), sheet_data)
+            logger.info("Saved sheet data to %s", file_path)
         except Exception as e:
-            logger.error(f"Error saving sheet {sheet_id}: {e}")
+            logger.error("Error saving sheet %s: %s", sheet_id, e)
             raise
     
+    def submit_sheet_save(self, executor: Executor, sheet_id: int, sheet_data: Dict[str, Any]) -> Future:
+        """Save sheet data on executor (e.g. a process pool); the future raises on failure"""
+        return executor.submit(
+            _write_sheet_files,
+            Config.get_sheet_file_path(sheet_id),
+            Config.get_sheet_meta_file_path(sheet_id),
+            sheet_data
+        )
+    
     def load_sheet_data(self, sheet_id: int) -> Optional[Dict[str, Any]]:
         """Load individual sheet data from JSON file"""
         try:
             file_path = Config.get_sheet_file_path(sheet_id)
             if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                logger.info(f"Loaded sheet data from {file_path}")
+                data = _load_file(file_path)
+                logger.info("Loaded sheet data from %s", file_path)
                 return data
             else:
-                logger.info(f"No data file found for sheet {sheet_id}")
+                logger.info("No data file found for sheet %s", sheet_id)
                 return None
         except Exception as e:
-            logger.error(f"Error loading sheet {sheet_id}: {e}")
+            logger.error("Error loading sheet %s: %s", sheet_id, e)
             return None
     
+    def touch_sheet(self, sheet_id: int, last_sync: str) -> None:
+        """Mark a stored sheet as confirmed current without rewriting its rows
+        
+        Updates last_sync in the metadata sidecar and bumps the sheet file's
+        mtime so cleanup_old_files keeps it. Failures are logged, not raised:
+        the stored data is still valid, only its bookkeeping is stale.
+        """
+        try:
+            file_path = Config.get_sheet_file_path(sheet_id)
+            metadata = self._load_sheet_metadata(file_path)
+            if metadata is not None:
+                metadata['last_sync'] = last_sync
+                _atomic_write(Config.get_sheet_meta_file_path(sheet_id), json_codec.dumps(metadata), durable=False)
+            os.utime(file_path)
+        except Exception as e:
+            logger.warning("Could not refresh sync time for sheet %s: %s", sheet_id, e)
+    
+    def flush_sheets_dir(self) -> None:
+        """fsync the sheets directory once so a batch of renames is persisted
+        
+        Sheet file data is already fsynced by _atomic_write; this makes the
+        directory entries pointing at the new files durable too.
+        """
+        try:
+            fd = os.open(Config.SHEETS_DIR, os.O_RDONLY)
+        except OSError:
+            # Directories can't be opened this way on every platform (e.g. Windows)
+            return
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            logger.warning("Could not fsync %s: %s", Config.SHEETS_DIR, e)
+        finally:
+            os.close(fd)
+    
+    def _load_sheet_metadata(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """Read metadata for a known sheet file without existence checks"""
+        try:
+            return json_codec.loads(file_path.with_suffix('.meta.json').read_bytes())
+        except (FileNotFoundError, ValueError):
+            # ValueError: a sidecar torn by a crash (sidecars aren't fsynced)
+            pass
+        
+        # Files written before sidecars existed: fall back to the full sheet
+        return _load_file(file_path).get('metadata')
+    
     def get_all_sheet_files(self) -> List[Path]:
         """Get list of all sheet JSON files"""
         try:
-            sheet_files = list(Config.SHEETS_DIR.glob("sheet_*.json"))
-            logger.info(f"Found {len(sheet_files)} sheet files")
+            sheet_files = [
+                path for path in Config.SHEETS_DIR.glob("sheet_*.json")
+                if not path.name.endswith('.meta.json')
+            ]
+            logger.info("Found %d sheet files", len(sheet_files))
             return sheet_files
         except Exception as e:
-            logger.error(f"Error listing sheet files: {e}")
+            logger.error("Error listing sheet files: %s", e)
             return []
     
+    def _scan_sheet_entries(self) -> List[os.DirEntry]:
+        """List sheet files as DirEntry objects, which cache their stat results"""
+        with os.scandir(Config.SHEETS_DIR) as it:
+            return [
+                entry for entry in it
+                if entry.name.startswith('sheet_')
+                and entry.name.endswith('.json')
+                and not entry.name.endswith('.meta.json')
+            ]
+    
     def save_sync_history(self, sync_record: Dict[str, Any]) -> None:
-        """Save sync operation to history"""
+        """Append sync operation to history"""
         try:
-            history = self.load_sync_history()
-            if history is None:
-                history = {'sync_operations': []}
+            self._migrate_legacy_sync_history()
             
             sync_record['timestamp'] = time.strftime('%Y-%m-%d %H:%M:%S')
-            history['sync_operations'].append(sync_record)
-            
-            # Keep only last 50 sync records
-            if len(history['sync_operations']) > 50:
-                history['sync_operations'] = history['sync_operations'][-50:]
+            with open(Config.SYNC_HISTORY_FILE, 'a+b') as f:
+                # A crash can leave a torn last line; start a fresh one so
+                # this record is not glued onto it
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write(json_codec.dumps_line(sync_record))
+                size = f.tell()
             
-            with open(Config.SYNC_HISTORY_FILE, 'w', encoding='utf-8') as f:
-                json.dump(history, f, indent=2, ensure_ascii=False)
+            # Appends are O(1); only rewrite once the file has grown well past the limit
+            if size > Config.SYNC_HISTORY_TRIM_BYTES:
+                self._trim_sync_history()
             logger.info("Saved sync history record")
         except Exception as e:
-            logger.error(f"Error saving sync history: {e}")
+            logger.error("Error saving sync history: %s", e)
             raise
     
+    def _trim_sync_history(self) -> None:
+        """Rewrite the history file keeping only the most recent records"""
+        recent = self.get_recent_sync_history()
+        _atomic_write(
+            Config.SYNC_HISTORY_FILE,
+            b''.join(json_codec.dumps_line(record) for record in recent)
+        )
+        logger.info("Trimmed sync history to %d records", len(recent))
+    
+    def _migrate_legacy_sync_history(self) -> None:
+        """Convert a sync_history.json from older versions to JSON Lines"""
+        legacy_file = Config.LEGACY_SYNC_HISTORY_FILE
+        if Config.SYNC_HISTORY_FILE.exists() or not legacy_file.exists():
+            return
+        data = json_codec.loads(legacy_file.read_bytes())
+        operations = data.get('sync_operations', []) if isinstance(data, dict) else []
+        _atomic_write(
+            Config.SYNC_HISTORY_FILE,
+            b''.join(json_codec.dumps_line(record) for record in operations)
+        )
+        legacy_file.unlink()
+        logger.info("Migrated %d sync records to %s", len(operations), Config.SYNC_HISTORY_FILE)
+    
+    def iter_sync_history(self) -> Iterator[Dict[str, Any]]:
+        """Yield sync records from oldest to newest"""
+        if not Config.SYNC_HISTORY_FILE.exists():
+            if Config.LEGACY_SYNC_HISTORY_FILE.exists():
+                data = json_codec.loads(Config.LEGACY_SYNC_HISTORY_FILE.read_bytes())
+                yield from data.get('sync_operations', [])
+            return
+        with open(Config.SYNC_HISTORY_FILE, 'rb') as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json_codec.loads(line)
+                except ValueError as e:
+                    # Typically a record torn by a crash mid-append
+                    logger.warning("Skipping unreadable sync history line %d: %s", line_number, e)
+                    continue
+                yield record
+    
+    def get_recent_sync_history(self, n: int = Config.SYNC_HISTORY_LIMIT) -> List[Dict[str, Any]]:
+        """Return the last n sync records, oldest first"""
+        return list(deque(self.iter_sync_history(), maxlen=n))
+    
     def load_sync_history(self) -> Optional[Dict[str, Any]]:
-        """Load sync history from JSON file"""
+        """Load recent sync history"""
         try:
-            if Config.SYNC_HISTORY_FILE.exists():
-                with open(Config.SYNC_HISTORY_FILE, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                return data
-            else:
+            if not (Config.SYNC_HISTORY_FILE.exists() or Config.LEGACY_SYNC_HISTORY_FILE.exists()):
                 return None
+            return {'sync_operations': self.get_recent_sync_history()}
+        except Exception as e:
+            logger.error("Error loading sync history: %s", e)
+            return None
+    
+    def _summarize_one(self, entry: os.DirEntry) -> Optional[Tuple[str, int, Optional[Dict[str, Any]]]]:
+        """Return (sheet_id, file_size, metadata) for one sheet file, or None on error"""
+        try:
+            file_size = entry.stat().st_size
+            
+            # Extract sheet ID from filename
+            sheet_id = entry.name[:-len('.json')].replace('sheet_', '')
+            
+            # Load just metadata to get basic info
+            return sheet_id, file_size, self._load_sheet_metadata(Path(entry.path))
         except Exception as e:
-            logger.error(f"Error loading sync history: {e}")
+            logger.warning("Error processing file %s: %s", entry.path, e)
             return None
     
+    def _summarize_all(self, sheet_entries: List[os.DirEntry]) -> List[Optional[Tuple[str, int, Optional[Dict[str, Any]]]]]:
+        """Run _summarize_one over every entry, in entry order"""
+        if not sheet_entries:
+            return []
+        # Per-file work is stat/read bound, so overlap it across threads
+        with ThreadPoolExecutor(max_workers=min(32, len(sheet_entries))) as executor:
+            return list(executor.map(self._summarize_one, sheet_entries))
+    
+    def get_stored_sheet_versions(self) -> Dict[int, Any]:
+        """Map sheet ID to the version of its stored copy"""
+        try:
+            versions = {}
+            for result in self._summarize_all(self._scan_sheet_entries()):
+                if result is None:
+                    continue
+                sheet_id, _, metadata = result
+                if metadata and metadata.get('version') is not None:
+                    versions[int(sheet_id)] = metadata['version']
+            return versions
+        except Exception as e:
+            logger.error("Error reading stored sheet versions: %s", e)
+            return {}
+    
     def get_sheet_summary(self) -> Dict[str, Any]:
         """Get summary of all stored sheet data"""
         try:
@@ -117,64 +309,58 @@ class JSONStorage:
                 'total_size_mb': 0
             }
             
-            sheet_files = self.get_all_sheet_files()
-            summary['total_sheets'] = len(sheet_files)
+            sheet_entries = self._scan_sheet_entries()
+            summary['total_sheets'] = len(sheet_entries)
+            
+            results = self._summarize_all(sheet_entries)
             
             total_size = 0
-            for file_path in sheet_files:
-                try:
-                    file_size = file_path.stat().st_size
-                    total_size += file_size
-                    
-                    # Extract sheet ID from filename
-                    sheet_id = file_path.stem.replace('sheet_', '')
-                    
-                    # Load just metadata to get basic info
-                    sheet_data = self.load_sheet_data(int(sheet_id))
-                    if sheet_data and 'metadata' in sheet_data:
-                        metadata = sheet_data['metadata']
-                        sheet_summary = {
-                            'id': sheet_id,
-                            'name': metadata.get('name', 'Unknown'),
-                            'last_sync': metadata.get('last_sync'),
-                            'row_count': metadata.get('total_row_count', 0),
-                            'size_kb': round(file_size / 1024, 2)
-                        }
-                        summary['sheets'].append(sheet_summary)
-                        
-                        # Track most recent update
-                        if metadata.get('last_sync'):
-                            if not summary['last_updated'] or metadata['last_sync'] > summary['last_updated']:
-                                summary['last_updated'] = metadata['last_sync']
-                
-                except Exception as e:
-                    logger.warning(f"Error processing file {file_path}: {e}")
+            for result in results:
+                if result is None:
                     continue
+                sheet_id, file_size, metadata = result
+                total_size += file_size
+                
+                if metadata:
+                    sheet_summary = {
+                        'id': sheet_id,
+                        'name': metadata.get('name', 'Unknown'),
+                        'last_sync': metadata.get('last_sync'),
+                        'row_count': metadata.get('total_row_count', 0),
+                        'size_kb': round(file_size / 1024, 2)
+                    }
+                    summary['sheets'].append(sheet_summary)
+                    
+                    # Track most recent update
+                    if metadata.get('last_sync'):
+                        if not summary['last_updated'] or metadata['last_sync'] > summary['last_updated']:
+                            summary['last_updated'] = metadata['last_sync']
             
             summary['total_size_mb'] = round(total_size / (1024 * 1024), 2)
             return summary
             
         except Exception as e:
-            logger.error(f"Error generating sheet summary: {e}")
+            logger.error("Error generating sheet summary: %s", e)
             return {'error': str(e)}
     
     def cleanup_old_files(self, keep_latest: int = 10) -> None:
         """Remove old sheet files, keeping only the latest ones"""
         try:
-            sheet_files = self.get_all_sheet_files()
-            if len(sheet_files) <= keep_latest:
+            sheet_entries = self._scan_sheet_entries()
+            if len(sheet_entries) <= keep_latest:
                 return
             
-            # Sort by modification time
-            sheet_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+            # Sort by modification time (DirEntry caches the stat result)
+            sheet_entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
             
-            files_to_remove = sheet_files[keep_latest:]
-            for file_path in files_to_remove:
-                file_path.unlink()
-                logger.info(f"Removed old file: {file_path}")
+            files_to_remove = sheet_entries[keep_latest:]
+            for entry in files_to_remove:
+                os.unlink(entry.path)
+                Path(entry.path).with_suffix('.meta.json').unlink(missing_ok=True)
+                logger.info("Removed old file: %s", entry.path)
             
-            logger.info(f"Cleaned up {len(files_to_remove)} old files")
+            logger.info("Cleaned up %d old files", len(files_to_remove))
             
         except Exception as e:
-            logger.error(f"Error during cleanup: {e}")
+            logger.error("Error during cleanup: %s", e)
             raise
\ No newline at end of file
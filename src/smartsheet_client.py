@@ -1,15 +1,105 @@
-import smartsheet
+import functools
+import importlib
+import importlib.util
+import itertools
+import queue
+import threading
 import time
-import urllib3
+import types
 import ssl
-import requests
-from typing import List, Dict, Any, Optional, Generator
+import sys
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, Dict, Any, Optional, Generator, Iterator, Tuple
 from config.settings import Config
 from utils.logger import setup_logger
+from utils import json_codec
+
+
+class _LazyLoader(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access"""
+    
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._mod = None
+    
+    def __getattr__(self, attr):
+        if self._mod is None:
+            self._mod = importlib.import_module(self.__name__)
+        return getattr(self._mod, attr)
+
+
+# The SDK and its HTTP stack are only needed once a client is constructed,
+# so commands that only touch local files never import them
+smartsheet = _LazyLoader('smartsheet')
+requests = _LazyLoader('requests')
+urllib3 = _LazyLoader('urllib3')
+# Optional incremental JSON parser used when STREAM_SHEETS is enabled
+ijson = _LazyLoader('ijson')
+# Only the async fetch backends run an event loop
+asyncio = _LazyLoader('asyncio')
 
 logger = setup_logger(__name__)
 
 ALLOWED_SECURITY_MODES = {'enterprise', 'testing'}
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# Times a paged fetch starts over when the sheet changes between pages
+SHEET_PAGE_RESTARTS = 2
+
+# Optional packages each async FETCH_BACKEND needs
+ASYNC_BACKEND_MODULES = {
+    'async': ('aiohttp',),
+    'http2': ('httpx', 'h2'),
+}
+
+
+def resolve_security_mode(override: Optional[str]) -> str:
+    """Normalize a security mode override, falling back to the configured mode"""
+    if override:
+        candidate = override.strip().lower()
+        if candidate in ALLOWED_SECURITY_MODES:
+            return candidate
+        logger.warning("Unrecognized security mode '%s', defaulting to config value", override)
+    return Config.SECURITY_MODE
+
+
+def _retry_after_seconds(value: Optional[str], default: float) -> float:
+    """Seconds to wait from a Retry-After header given as seconds or an HTTP-date"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+def _next_json_value(events: Iterator[Tuple[str, str, Any]], first: Optional[Tuple[str, str, Any]] = None) -> Any:
+    """Assemble the next complete JSON value from an ijson event stream"""
+    builder = ijson.ObjectBuilder()
+    depth = 0
+    for _, event, value in itertools.chain([first] if first else (), events):
+        builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+        if depth == 0:
+            return builder.value
+
+
+def _iter_json_array(events: Iterator[Tuple[str, str, Any]]) -> Iterator[Any]:
+    """Yield the items of the JSON array that starts next in an ijson event stream"""
+    if next(events)[1] != 'start_array':
+        return
+    for first in events:
+        if first[1] == 'end_array':
+            return
+        yield _next_json_value(events, first)
 
 
 class SmartsheetClient:
@@ -17,11 +107,12 @@ class SmartsheetClient:
         self.security_mode = self._resolve_security_mode(security_mode)
         self.client = smartsheet.Smartsheet(Config.SMARTSHEET_API_TOKEN)
         self.client.errors_as_exceptions(True)
-        self._http_session: requests.Session = self._get_http_session()
+        self._http_session: 'requests.Session' = self._build_http_session()
+        self._stream_sheets = self._resolve_stream_sheets()
         
         self._configure_ssl_and_proxy()
 
-    def _get_http_session(self) -> requests.Session:
+    def _get_http_session(self) -> 'requests.Session':
         """Return the underlying requests session, supporting both public and private Smartsheet attributes"""
         session = getattr(self.client, 'session', None)
         if session is None:
@@ -30,22 +121,64 @@ class SmartsheetClient:
             raise AttributeError("Smartsheet client does not expose an HTTP session accessor")
         return session
     
-    def _serialize_value(self, value):
-        """Convert Smartsheet objects to JSON-serializable values"""
-        if hasattr(value, 'name'):  # EnumeratedValue objects have a 'name' attribute
-            return value.name
-        elif hasattr(value, '__dict__'):  # Other complex objects
-            return str(value)
-        else:
-            return value
+    def _http_adapter_kwargs(self, pool_size: int) -> Dict[str, Any]:
+        """Connection pool and retry settings shared by every mounted adapter"""
+        return {
+            'pool_connections': pool_size,
+            'pool_maxsize': pool_size,
+            # The only retry layer for requests-based calls, 429 included;
+            # Retry-After is honoured on rate-limit responses
+            'max_retries': urllib3.util.Retry(
+                total=Config.MAX_RETRIES,
+                backoff_factor=0.5,
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=frozenset({'GET'}),
+                raise_on_status=False
+            )
+        }
+    
+    def _build_http_session(self) -> 'requests.Session':
+        """Swap the SDK's session for one with a larger keep-alive pool and retries"""
+        session = requests.Session()
+        # Keep the SDK's response hooks (they redact the token from logged requests)
+        session.hooks = self._get_http_session().hooks
+        # Replaced by _configure_ssl_and_proxy when SSL verification is off
+        self._https_adapter_class = requests.adapters.HTTPAdapter
+        self._http_pool_size = 0
+        # Never fewer pooled connections than concurrent fetch workers
+        self._mount_adapters(session, max(Config.HTTP_POOL_SIZE, Config.FETCH_CONCURRENCY))
+        # Built once here instead of per request. requests already advertises
+        # br in Accept-Encoding when the brotli package is installed
+        session.headers['Authorization'] = f'Bearer {Config.SMARTSHEET_API_TOKEN}'
+        self.client._session = session
+        return session
+    
+    def _mount_adapters(self, session: 'requests.Session', pool_size: int) -> None:
+        """Mount fresh adapters holding pool_size keep-alive connections per host"""
+        for prefix, adapter_class in (('https://', self._https_adapter_class), ('http://', requests.adapters.HTTPAdapter)):
+            previous = session.adapters.get(prefix)
+            session.mount(prefix, adapter_class(**self._http_adapter_kwargs(pool_size)))
+            if previous is not None:
+                previous.close()
+        self._http_pool_size = pool_size
+    
+    def _ensure_http_pool(self, max_workers: int) -> None:
+        """Grow the connection pool so max_workers fetch threads never wait for a connection"""
+        if max_workers > self._http_pool_size:
+            logger.info("Growing HTTP connection pool to %d connections", max_workers)
+            self._mount_adapters(self._http_session, max_workers)
+    
+    def _resolve_stream_sheets(self) -> bool:
+        """Whether sheet bodies are parsed incrementally; needs the optional ijson package"""
+        if not Config.STREAM_SHEETS:
+            return False
+        if importlib.util.find_spec('ijson') is None:
+            logger.warning("STREAM_SHEETS requires ijson; parsing whole responses instead")
+            return False
+        return True
     
     def _resolve_security_mode(self, override: Optional[str]) -> str:
-        if override:
-            candidate = override.strip().lower()
-            if candidate in ALLOWED_SECURITY_MODES:
-                return candidate
-            logger.warning(f"Unrecognized security mode '{override}', defaulting to config value")
-        return Config.SECURITY_MODE
+        return resolve_security_mode(override)
     
     def _configure_ssl_and_proxy(self):
         """Configure SSL verification and proxy settings for enterprise environments"""
@@ -62,10 +195,9 @@ class SmartsheetClient:
             logger.warning("SSL verification is disabled. This is not recommended for production.")
             self._http_session.verify = False
             # Create a custom HTTPSAdapter that doesn't verify hostnames
-            from requests.adapters import HTTPAdapter
             from urllib3.util.ssl_ import create_urllib3_context
             
-            class NoSSLVerifyHTTPSAdapter(HTTPAdapter):
+            class NoSSLVerifyHTTPSAdapter(requests.adapters.HTTPAdapter):
                 def init_poolmanager(self, *args, **pool_kwargs):
                     context = create_urllib3_context()
                     context.check_hostname = False
@@ -73,21 +205,22 @@ class SmartsheetClient:
                     pool_kwargs['ssl_context'] = context
                     return super().init_poolmanager(*args, **pool_kwargs)
             
-            self._http_session.mount('https://', NoSSLVerifyHTTPSAdapter())
+            self._https_adapter_class = NoSSLVerifyHTTPSAdapter
+            self._mount_adapters(self._http_session, self._http_pool_size)
         elif Config.SSL_CA_BUNDLE:
-            logger.info(f"Using custom CA bundle: {Config.SSL_CA_BUNDLE}")
+            logger.info("Using custom CA bundle: %s", Config.SSL_CA_BUNDLE)
             self._http_session.verify = Config.SSL_CA_BUNDLE
         elif Config.SSL_CERT_PATH:
-            logger.info(f"Using SSL certificate: {Config.SSL_CERT_PATH}")
+            logger.info("Using SSL certificate: %s", Config.SSL_CERT_PATH)
             self._http_session.verify = Config.SSL_CERT_PATH
         
         proxies = {}
         if Config.PROXY_HTTP:
             proxies['http'] = Config.PROXY_HTTP
-            logger.info(f"Using HTTP proxy: {Config.PROXY_HTTP}")
+            logger.info("Using HTTP proxy: %s", Config.PROXY_HTTP)
         if Config.PROXY_HTTPS:
             proxies['https'] = Config.PROXY_HTTPS
-            logger.info(f"Using HTTPS proxy: {Config.PROXY_HTTPS}")
+            logger.info("Using HTTPS proxy: %s", Config.PROXY_HTTPS)
         
         if proxies:
             self._http_session.proxies.update(proxies)
@@ -95,119 +228,471 @@ class SmartsheetClient:
     def get_workspace_info(self) -> Dict[str, Any]:
         """Get workspace information and metadata"""
         try:
-            workspace = self.client.Workspaces.get_workspace(Config.WORKSPACE_ID)
-            logger.info(f"Retrieved workspace: {workspace.name}")
+            workspace = self._raw_get(f"/workspaces/{Config.WORKSPACE_ID}")
+            logger.info("Retrieved workspace: %s", workspace.get('name'))
             
             return {
-                'id': workspace.id,
-                'name': workspace.name,
-                'permalink': workspace.permalink,
+                'id': workspace.get('id'),
+                'name': workspace.get('name'),
+                'permalink': workspace.get('permalink'),
                 'last_fetched': time.strftime('%Y-%m-%d %H:%M:%S'),
-                'sheet_count': len(workspace.sheets) if workspace.sheets else 0
+                'sheet_count': len(workspace.get('sheets') or ())
             }
         except Exception as e:
-            logger.error(f"Error fetching workspace info: {e}")
+            logger.error("Error fetching workspace info: %s", e)
             raise
 
     def get_all_sheets_in_workspace(self) -> List[Dict[str, Any]]:
         """Get list of all sheets in the workspace"""
         try:
-            workspace = self.client.Workspaces.get_workspace(
-                Config.WORKSPACE_ID, 
-                include='sheets'
+            workspace = self._raw_get(
+                f"/workspaces/{Config.WORKSPACE_ID}",
+                params={'include': 'sheets,sheetVersion'}
             )
             
-            if not workspace.sheets:
+            if not workspace.get('sheets'):
                 logger.warning("No sheets found in workspace")
                 return []
             
             sheets_info = []
-            for sheet in workspace.sheets:
+            for sheet in workspace['sheets']:
                 sheet_info = {
-                    'id': sheet.id,
-                    'name': sheet.name,
-                    'permalink': sheet.permalink,
-                    'created_at': sheet.created_at.isoformat() if sheet.created_at else None,
-                    'modified_at': sheet.modified_at.isoformat() if sheet.modified_at else None,
-                    'access_level': self._serialize_value(sheet.access_level)
+                    'id': sheet.get('id'),
+                    'name': sheet.get('name'),
+                    'permalink': sheet.get('permalink'),
+                    'created_at': sheet.get('createdAt'),
+                    'modified_at': sheet.get('modifiedAt'),
+                    'access_level': sheet.get('accessLevel'),
+                    'version': sheet.get('version')
                 }
                 sheets_info.append(sheet_info)
             
-            logger.info(f"Found {len(sheets_info)} sheets in workspace")
+            logger.info("Found %d sheets in workspace", len(sheets_info))
             return sheets_info
             
         except Exception as e:
-            logger.error(f"Error fetching sheets list: {e}")
+            logger.error("Error fetching sheets list: %s", e)
+            raise
+    
+    def _raw_get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Issue a GET against the REST API and return the decoded JSON body"""
+        response = self._http_session.get(
+            f"{self.client._api_base}{path}",
+            params=params,
+            timeout=Config.REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        return json_codec.loads(response.content)
+    
+    def _stream_get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+        """Issue a GET and parse the body incrementally while it downloads
+        
+        Returns the top-level fields that precede 'rows' and a lazy iterator
+        over the raw rows. Fields after 'rows' are added to the dict once the
+        iterator is exhausted, and the response is released then.
+        """
+        response = self._http_session.get(
+            f"{self.client._api_base}{path}",
+            params=params,
+            timeout=Config.REQUEST_TIMEOUT,
+            stream=True
+        )
+        try:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            events = ijson.parse(response.raw, use_float=True)
+            
+            fields = {}
+            has_rows = False
+            for prefix, event, value in events:
+                if prefix == '' and event == 'map_key':
+                    if value == 'rows':
+                        has_rows = True
+                        break
+                    fields[value] = _next_json_value(events)
+        except Exception:
+            response.close()
             raise
+        
+        def rows() -> Iterator[Dict[str, Any]]:
+            try:
+                if has_rows:
+                    yield from _iter_json_array(events)
+                    for prefix, event, value in events:
+                        if prefix == '' and event == 'map_key':
+                            fields[value] = _next_json_value(events)
+            finally:
+                response.close()
+        
+        return fields, rows()
     
-    def get_sheet_data(self, sheet_id: int) -> Dict[str, Any]:
-        """Get complete data for a specific sheet"""
+    def get_sheet_data(self, sheet_id: int, sync_time: Optional[str] = None) -> Dict[str, Any]:
+        """Get complete data for a specific sheet
+        
+        sync_time is recorded as the sheet's last_sync; batch callers pass one
+        timestamp for the whole sync instead of formatting it per sheet.
+        """
         try:
-            logger.info(f"Fetching data for sheet ID: {sheet_id}")
-            
-            sheet = self.client.Sheets.get_sheet(sheet_id)
-            
-            sheet_data = {
-                'metadata': {
-                    'id': sheet.id,
-                    'name': sheet.name,
-                    'permalink': sheet.permalink,
-                    'version': sheet.version,
-                    'total_row_count': sheet.total_row_count,
-                    'created_at': sheet.created_at.isoformat() if sheet.created_at else None,
-                    'modified_at': sheet.modified_at.isoformat() if sheet.modified_at else None,
-                    'last_sync': time.strftime('%Y-%m-%d %H:%M:%S')
-                },
-                'columns': [],
-                'rows': []
-            }
+            logger.info("Fetching data for sheet ID: %s", sheet_id)
             
-            if sheet.columns:
-                for column in sheet.columns:
-                    column_data = {
-                        'id': column.id,
-                        'title': column.title,
-                        'type': self._serialize_value(column.type),
-                        'primary': column.primary,
-                        'index': column.index,
-                        'width': column.width,
-                        'locked': column.locked
-                    }
-                    sheet_data['columns'].append(column_data)
-            
-            if sheet.rows:
-                for row in sheet.rows:
-                    row_data = {
-                        'id': row.id,
-                        'row_number': row.row_number,
-                        'parent_id': row.parent_id,
-                        'version': row.version,
-                        'created_at': row.created_at.isoformat() if row.created_at else None,
-                        'modified_at': row.modified_at.isoformat() if row.modified_at else None,
-                        'cells': {}
-                    }
-                    
-                    if row.cells:
-                        for cell in row.cells:
-                            column_id = str(cell.column_id)
-                            cell_data = {
-                                'value': self._serialize_value(cell.value),
-                                'display_value': self._serialize_value(cell.display_value),
-                                'formula': cell.formula
-                            }
-                            row_data['cells'][column_id] = cell_data
-                    
-                    sheet_data['rows'].append(row_data)
+            for attempt in itertools.count():
+                sheet_data = self._fetch_sheet_pages(sheet_id, sync_time)
+                if sheet_data is not None:
+                    break
+                self._check_page_restart(sheet_id, attempt)
             
-            logger.info(f"Successfully fetched sheet '{sheet.name}' with {len(sheet_data['rows'])} rows")
+            logger.info("Successfully fetched sheet '%s' with %d rows", sheet_data['metadata']['name'], len(sheet_data['rows']))
             return sheet_data
             
         except Exception as e:
-            logger.error(f"Error fetching sheet {sheet_id}: {e}")
+            logger.error("Error fetching sheet %s: %s", sheet_id, e)
             raise
-
-    def fetch_all_workspace_data(self) -> Generator[Dict[str, Any], None, None]:
-        """Fetch all data from workspace including metadata and all sheets"""
+    
+    def _fetch_sheet_pages(self, sheet_id: int, sync_time: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Fetch and convert every page of a sheet
+        
+        Returns None if a later page reports a different sheet version than
+        page 1, since stitching the two would mix rows from both versions.
+        """
+        # Rows are fetched a page at a time and converted as each page
+        # arrives, so only one raw page is held in memory at once
+        sheet_data = col_id_cache = None
+        for page in itertools.count(1):
+            if self._stream_sheets:
+                # Rows are converted while the rest of the body is still arriving
+                payload, rows = self._stream_get(
+                    f"/sheets/{sheet_id}",
+                    params=self._page_params(page)
+                )
+            else:
+                payload = self._raw_get(
+                    f"/sheets/{sheet_id}",
+                    params=self._page_params(page)
+                )
+                rows = payload.get('rows')
+            if sheet_data is None:
+                sheet_data, col_id_cache = self._start_sheet_data(payload, sync_time)
+            rows_before = len(sheet_data['rows'])
+            self._append_rows(sheet_data, col_id_cache, rows)
+            if self._stream_sheets and page == 1:
+                # Fields after 'rows' in a streamed body are only known now.
+                # Cell keys don't depend on the column list, so rows already
+                # converted stay valid when columns arrive late
+                last_sync = sheet_data['metadata']['last_sync']
+                sheet_data['metadata'] = self._sheet_metadata(payload, last_sync)
+                if not sheet_data['columns'] and payload.get('columns'):
+                    started, col_id_cache = self._start_sheet_data(payload, last_sync)
+                    sheet_data['columns'] = started['columns']
+            if page > 1 and not self._same_version(sheet_data, payload):
+                return None
+            if self._is_last_page(payload, len(sheet_data['rows']) - rows_before, len(sheet_data['rows'])):
+                break
+        
+        return sheet_data
+    
+    def _same_version(self, sheet_data: Dict[str, Any], payload: Dict[str, Any]) -> bool:
+        """True unless a page's version differs from the one recorded from page 1"""
+        page_version = payload.get('version')
+        return page_version is None or page_version == sheet_data['metadata']['version']
+    
+    def _check_page_restart(self, sheet_id: int, attempt: int) -> None:
+        """Log a restart after the sheet changed mid-fetch, or raise once out of restarts"""
+        if attempt >= SHEET_PAGE_RESTARTS:
+            raise RuntimeError(f"Sheet {sheet_id} kept changing while its pages were fetched")
+        logger.warning("Sheet %s changed between pages, fetching it again", sheet_id)
+    
+    def _page_params(self, page: int) -> Optional[Dict[str, Any]]:
+        """Query params for one page of rows, or None when paging is disabled"""
+        if Config.SHEET_PAGE_SIZE <= 0:
+            return None
+        return {'page': page, 'pageSize': Config.SHEET_PAGE_SIZE}
+    
+    def _is_last_page(self, payload: Dict[str, Any], page_rows: int, rows_so_far: int) -> bool:
+        """True once a short page arrives or every row has been collected"""
+        if Config.SHEET_PAGE_SIZE <= 0:
+            return True
+        if page_rows < Config.SHEET_PAGE_SIZE:
+            return True
+        return rows_so_far >= (payload.get('totalRowCount') or 0)
+    
+    def _sheet_metadata(self, sheet: Dict[str, Any], sync_time: Optional[str] = None) -> Dict[str, Any]:
+        """Build the stored metadata block from a raw sheet payload"""
+        return {
+            'id': sheet.get('id'),
+            'name': sheet.get('name'),
+            'permalink': sheet.get('permalink'),
+            'version': sheet.get('version'),
+            'total_row_count': sheet.get('totalRowCount'),
+            'created_at': sheet.get('createdAt'),
+            'modified_at': sheet.get('modifiedAt'),
+            'last_sync': sync_time or time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+    
+    def _start_sheet_data(self, sheet: Dict[str, Any], sync_time: Optional[str] = None) -> Tuple[Dict[str, Any], Dict[Any, str]]:
+        """Build metadata and columns from the first raw page of a sheet
+        
+        Returns the partially built sheet data and the column-id key cache
+        used by _append_rows.
+        """
+        columns = sheet.get('columns') or ()
+        sheet_data = {
+            'metadata': self._sheet_metadata(sheet, sync_time),
+            'columns': [
+                {
+                    'id': column.get('id'),
+                    'title': column.get('title'),
+                    'type': column.get('type'),
+                    'primary': column.get('primary'),
+                    'index': column.get('index'),
+                    'width': column.get('width'),
+                    'locked': column.get('locked')
+                }
+                for column in columns
+            ],
+            'rows': []
+        }
+        
+        # One shared key string per column instead of a new str() per cell
+        col_id_cache = {
+            column.get('id'): sys.intern(str(column.get('id')))
+            for column in columns
+        }
+        
+        return sheet_data, col_id_cache
+    
+    def _append_rows(self, sheet_data: Dict[str, Any], col_id_cache: Dict[Any, str], rows: Optional[List[Dict[str, Any]]]) -> None:
+        """Convert raw rows into the stored format and append them to sheet_data"""
+        # Comprehensions keep the per-row and per-cell work in tight bytecode
+        column_key = col_id_cache.get
+        sheet_data['rows'].extend([
+            {
+                'id': row.get('id'),
+                'row_number': row.get('rowNumber'),
+                'parent_id': row.get('parentId'),
+                'version': row.get('version'),
+                'created_at': row.get('createdAt'),
+                'modified_at': row.get('modifiedAt'),
+                'cells': {
+                    column_key(cell.get('columnId')) or str(cell.get('columnId')): {
+                        'value': cell.get('value'),
+                        'display_value': cell.get('displayValue'),
+                        'formula': cell.get('formula')
+                    }
+                    for cell in row.get('cells') or ()
+                }
+            }
+            for row in rows or ()
+        ])
+    
+    def _iter_sheet_fetches(self, sheets_list: List[Dict[str, Any]], max_workers: int, sync_time: Optional[str] = None) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Yield (sheet_info, sheet_data, error) for each sheet using the configured backend"""
+        if Config.FETCH_BACKEND in ASYNC_BACKEND_MODULES:
+            missing = [m for m in ASYNC_BACKEND_MODULES[Config.FETCH_BACKEND] if importlib.util.find_spec(m) is None]
+            if not missing:
+                yield from self._iter_async_fetches(sheets_list, max_workers, sync_time, http2=Config.FETCH_BACKEND == 'http2')
+                return
+            logger.warning("FETCH_BACKEND=%s requires %s; falling back to threads", Config.FETCH_BACKEND, ', '.join(missing))
+        
+        # Fetches are network bound, so keep several requests in flight, but
+        # only max_workers at a time: sheets are submitted as earlier ones are
+        # handed on, so a slow consumer holds back downloading
+        remaining = iter(sheets_list)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            def submit(sheet_info: Dict[str, Any]) -> None:
+                futures[executor.submit(self.get_sheet_data, sheet_info['id'], sync_time=sync_time)] = sheet_info
+            
+            futures = {}
+            for sheet_info in itertools.islice(remaining, max_workers):
+                submit(sheet_info)
+            
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # Popped so a consumed sheet isn't kept alive by its Future
+                    sheet_info = futures.pop(future)
+                    for next_sheet in itertools.islice(remaining, 1):
+                        submit(next_sheet)
+                    try:
+                        yield sheet_info, future.result(), None
+                    except Exception as e:
+                        yield sheet_info, None, e
+                # Don't keep the last batch of results alive while waiting
+                del done, future
+    
+    def _iter_async_fetches(self, sheets_list: List[Dict[str, Any]], max_workers: int, sync_time: Optional[str] = None, http2: bool = False) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Exception]]]:
+        """Run afetch_sheets on a helper thread and yield each result as it completes
+        
+        Results are handed over through a bounded queue, so downloaded sheets
+        reach the caller (and the storage writer) while others are in flight
+        instead of all at once. Closing the generator early stops new fetches.
+        """
+        results = queue.Queue(maxsize=max_workers)
+        stop = threading.Event()
+        done = object()
+        failure = []
+        
+        def deliver(item) -> None:
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+        
+        def run() -> None:
+            try:
+                asyncio.run(self.afetch_sheets(sheets_list, max_workers, deliver, stop, sync_time, http2=http2))
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                deliver(done)
+        
+        loop_thread = threading.Thread(target=run, name='async-fetch', daemon=True)
+        loop_thread.start()
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                yield item
+            if failure:
+                raise failure[0]
+        finally:
+            stop.set()
+            loop_thread.join()
+    
+    def _async_ssl(self):
+        """Translate the requests session's verify setting into an async client's ssl argument"""
+        verify = self._http_session.verify
+        if verify is False:
+            return False
+        if isinstance(verify, str):
+            return ssl.create_default_context(cafile=verify)
+        return ssl.create_default_context()
+    
+    async def _aget_json(self, session, url: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """GET url with aiohttp, retrying rate-limit and server errors"""
+        proxy = self._http_session.proxies.get('https')
+        attempt = 0
+        while True:
+            async with session.get(url, params=params, proxy=proxy) as response:
+                if response.status in RETRY_STATUS_CODES and attempt < Config.MAX_RETRIES:
+                    attempt += 1
+                    backoff = _retry_after_seconds(response.headers.get('Retry-After'), 2 ** attempt)
+                    logger.warning("HTTP %s fetching %s, retrying in %ss", response.status, url, backoff)
+                    await asyncio.sleep(backoff)
+                    continue
+                response.raise_for_status()
+                return json_codec.loads(await response.read())
+    
+    async def _ahttpx_get_json(self, client, url: str, params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """GET url with an httpx client, retrying rate-limit and server errors"""
+        attempt = 0
+        while True:
+            response = await client.get(url, params=params)
+            if response.status_code in RETRY_STATUS_CODES and attempt < Config.MAX_RETRIES:
+                attempt += 1
+                backoff = _retry_after_seconds(response.headers.get('Retry-After'), 2 ** attempt)
+                logger.warning("HTTP %s fetching %s, retrying in %ss", response.status_code, url, backoff)
+                await asyncio.sleep(backoff)
+                continue
+            response.raise_for_status()
+            return json_codec.loads(response.content)
+    
+    async def aget_sheet_data(self, get_json, sheet_id: int, sync_time: Optional[str] = None) -> Dict[str, Any]:
+        """Async counterpart of get_sheet_data; get_json(url, params) performs one GET"""
+        url = f"{self.client._api_base}/sheets/{sheet_id}"
+        logger.info("Fetching data for sheet ID: %s", sheet_id)
+        for attempt in itertools.count():
+            sheet_data = col_id_cache = None
+            for page in itertools.count(1):
+                payload = await get_json(url, self._page_params(page))
+                if sheet_data is None:
+                    sheet_data, col_id_cache = self._start_sheet_data(payload, sync_time)
+                self._append_rows(sheet_data, col_id_cache, payload.get('rows'))
+                if page > 1 and not self._same_version(sheet_data, payload):
+                    sheet_data = None
+                    break
+                if self._is_last_page(payload, len(payload.get('rows') or ()), len(sheet_data['rows'])):
+                    break
+            if sheet_data is not None:
+                break
+            self._check_page_restart(sheet_id, attempt)
+        
+        logger.info("Successfully fetched sheet '%s' with %d rows", sheet_data['metadata']['name'], len(sheet_data['rows']))
+        return sheet_data
+    
+    async def afetch_sheets(self, sheets_list: List[Dict[str, Any]], max_workers: int, deliver, stop: threading.Event, sync_time: Optional[str] = None, http2: bool = False) -> None:
+        """Fetch many sheets concurrently on one event loop, bounded by a semaphore
+        
+        Each (sheet_info, sheet_data, error) result is passed to the blocking
+        deliver callable while its semaphore slot is still held, so at most
+        max_workers finished sheets wait in memory. Once stop is set, sheets
+        not yet started are skipped.
+        
+        Uses aiohttp by default; with http2=True an httpx client multiplexes
+        the requests over HTTP/2 connections instead.
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+        headers = {'Authorization': self._http_session.headers['Authorization']}
+        pool_size = max(Config.HTTP_POOL_SIZE, max_workers)
+        # Built once per client: aiohttp keys pooled connections on the ssl
+        # object, so a new context per request would defeat connection reuse
+        ssl_context = self._async_ssl()
+        
+        if http2:
+            import httpx
+            
+            session = httpx.AsyncClient(
+                http2=True,
+                headers=headers,
+                limits=httpx.Limits(max_connections=pool_size),
+                timeout=Config.REQUEST_TIMEOUT,
+                verify=ssl_context,
+                proxy=self._http_session.proxies.get('https')
+            )
+            get_json = functools.partial(self._ahttpx_get_json, session)
+        else:
+            import aiohttp
+            
+            session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=pool_size, ssl=ssl_context),
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT)
+            )
+            get_json = functools.partial(self._aget_json, session)
+        
+        loop = asyncio.get_running_loop()
+        
+        async def fetch_one(sheet_info: Dict[str, Any]) -> None:
+            async with semaphore:
+                if stop.is_set():
+                    return
+                try:
+                    result = (sheet_info, await self.aget_sheet_data(get_json, sheet_info['id'], sync_time), None)
+                except Exception as e:
+                    result = (sheet_info, None, e)
+                await loop.run_in_executor(None, deliver, result)
+        
+        async with session:
+            await asyncio.gather(*(fetch_one(sheet_info) for sheet_info in sheets_list))
+    
+    def fetch_all_workspace_data(
+        self,
+        max_workers: Optional[int] = None,
+        known_versions: Optional[Dict[int, Any]] = None,
+        sync_time: Optional[str] = None
+    ) -> Generator[Dict[str, Any], None, None]:
+        """Fetch all data from workspace including metadata and all sheets
+        
+        Sheets whose listed version matches known_versions are not downloaded;
+        they are yielded with 'unchanged': True and no sheet_data. Every sheet
+        fetched in this call shares one last_sync timestamp (sync_time).
+        """
+        max_workers = max_workers or Config.FETCH_CONCURRENCY
+        self._ensure_http_pool(max_workers)
+        sync_time = sync_time or time.strftime('%Y-%m-%d %H:%M:%S')
+        known_versions = known_versions or {}
         try:
             logger.info("Starting full workspace data fetch")
             
@@ -221,29 +706,46 @@ class SmartsheetClient:
                     'total_sheets': len(sheets_list),
                     'successful_fetches': 0,
                     'failed_fetches': 0,
+                    'unchanged': 0,
                     'errors': []
                 }
             }
             
+            to_fetch = []
             for sheet_info in sheets_list:
-                try:
-                    sheet_data = self.get_sheet_data(sheet_info['id'])
+                version = sheet_info.get('version')
+                if version is not None and known_versions.get(sheet_info['id']) == version:
+                    all_data['fetch_summary']['unchanged'] += 1
+                    yield {
+                        'sheet_info': sheet_info,
+                        'sheet_data': None,
+                        'unchanged': True
+                    }
+                else:
+                    to_fetch.append(sheet_info)
+            
+            for sheet_info, sheet_data, error in self._iter_sheet_fetches(to_fetch, max_workers, sync_time):
+                if error is None:
                     all_data['fetch_summary']['successful_fetches'] += 1
                     
                     yield {
                         'sheet_info': sheet_info,
                         'sheet_data': sheet_data
                     }
-                    
-                except Exception as e:
-                    error_msg = f"Failed to fetch sheet {sheet_info['name']} (ID: {sheet_info['id']}): {e}"
+                else:
+                    error_msg = f"Failed to fetch sheet {sheet_info['name']} (ID: {sheet_info['id']}): {error}"
                     logger.error(error_msg)
                     all_data['fetch_summary']['failed_fetches'] += 1
                     all_data['fetch_summary']['errors'].append(error_msg)
-                    continue
             
-            logger.info(f"Workspace fetch complete. Success: {all_data['fetch_summary']['successful_fetches']}, Failed: {all_data['fetch_summary']['failed_fetches']}")
+            logger.info("Workspace fetch complete. Success: %s, Failed: %s, Unchanged: %s", all_data['fetch_summary']['successful_fetches'], all_data['fetch_summary']['failed_fetches'], all_data['fetch_summary']['unchanged'])
             
         except Exception as e:
-            logger.error(f"Error in full workspace fetch: {e}")
+            logger.error("Error in full workspace fetch: %s", e)
             raise
+
+
+@functools.cache
+def get_smartsheet_client(security_mode: Optional[str] = None) -> SmartsheetClient:
+    """Return a shared client per security mode so HTTP connections are reused"""
+    return SmartsheetClient(security_mode=security_mode)
@@ -1,7 +1,9 @@
+import queue
+import threading
 import time
 from typing import Dict, Any, List, Optional
 from config.settings import Config
-from src.smartsheet_client import SmartsheetClient
+from src.smartsheet_client import SmartsheetClient, get_smartsheet_client, resolve_security_mode
 from src.json_storage import JSONStorage
 from utils.logger import setup_logger
 
@@ -9,23 +11,33 @@ logger = setup_logger(__name__)
 
 class SyncManager:
     def __init__(self, security_mode: Optional[str] = None):
-        self.smartsheet_client = SmartsheetClient(security_mode=security_mode or Config.SECURITY_MODE)
-        self.security_mode = self.smartsheet_client.security_mode
-        logger.info(f"SyncManager initialized with security mode: {self.security_mode}")
+        self.security_mode = resolve_security_mode(security_mode or Config.SECURITY_MODE)
+        self._smartsheet_client: Optional[SmartsheetClient] = None
+        logger.info("SyncManager initialized with security mode: %s", self.security_mode)
         self.storage = JSONStorage()
+    
+    @property
+    def smartsheet_client(self) -> SmartsheetClient:
+        """Smartsheet client, created on first use so local-only commands skip the SDK"""
+        if self._smartsheet_client is None:
+            self._smartsheet_client = get_smartsheet_client(self.security_mode)
+        return self._smartsheet_client
         
-    def full_sync(self) -> Dict[str, Any]:
+    def full_sync(self, force_refresh: bool = False) -> Dict[str, Any]:
         """Perform full synchronization of all workspace data"""
         start_time = time.time()
+        # One formatted timestamp per sync, shared by the result and every sheet
+        start_iso = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))
         logger.info("Starting full workspace sync")
         
         sync_result = {
             'sync_type': 'full',
-            'start_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'start_time': start_iso,
             'workspace_id': None,
             'total_sheets': 0,
             'successful_sheets': 0,
             'failed_sheets': 0,
+            'unchanged_sheets': 0,
             'errors': [],
             'duration_seconds': 0,
             'status': 'running'
@@ -39,40 +51,54 @@ class SyncManager:
             # Save workspace metadata
             self.storage.save_workspace_metadata(workspace_info)
             
-            # Get and process all sheets
+            # Sheets whose stored version is current are skipped unless refreshing
+            known_versions = {} if force_refresh else self.storage.get_stored_sheet_versions()
+            
+            # Sheets are saved on a dedicated writer thread so disk writes
+            # overlap with fetching; the bounded queue caps how many fetched
+            # sheets wait in memory for the writer
             sheet_results = []
-            for sheet_result in self.smartsheet_client.fetch_all_workspace_data():
-                sheet_info = sheet_result['sheet_info']
-                sheet_data = sheet_result['sheet_data']
-                
-                try:
-                    # Save sheet data
-                    self.storage.save_sheet_data(sheet_info['id'], sheet_data)
-                    sync_result['successful_sheets'] += 1
-                    
-                    sheet_results.append({
-                        'sheet_id': sheet_info['id'],
-                        'sheet_name': sheet_info['name'],
-                        'status': 'success',
-                        'row_count': sheet_data['metadata']['total_row_count']
-                    })
-                    
-                    logger.info(f"Successfully synced sheet: {sheet_info['name']}")
+            results_lock = threading.Lock()
+            store_queue = queue.Queue(maxsize=Config.STORE_QUEUE_SIZE)
+            writer = threading.Thread(
+                target=self._store_worker,
+                args=(store_queue, sync_result, sheet_results, results_lock),
+                name='sheet-writer'
+            )
+            writer.start()
+            
+            try:
+                for sheet_result in self.smartsheet_client.fetch_all_workspace_data(
+                    known_versions=known_versions,
+                    sync_time=start_iso
+                ):
+                    sheet_info = sheet_result['sheet_info']
                     
-                except Exception as e:
-                    error_msg = f"Failed to save sheet {sheet_info['name']}: {e}"
-                    logger.error(error_msg)
-                    sync_result['failed_sheets'] += 1
-                    sync_result['errors'].append(error_msg)
+                    if sheet_result.get('unchanged'):
+                        self.storage.touch_sheet(sheet_info['id'], start_iso)
+                        with results_lock:
+                            sync_result['unchanged_sheets'] += 1
+                            sheet_results.append({
+                                'sheet_id': sheet_info['id'],
+                                'sheet_name': sheet_info['name'],
+                                'status': 'unchanged',
+                                'version': sheet_info.get('version')
+                            })
+                        continue
                     
-                    sheet_results.append({
-                        'sheet_id': sheet_info['id'],
-                        'sheet_name': sheet_info['name'],
-                        'status': 'failed',
-                        'error': str(e)
-                    })
+                    if not self._put_while_alive(store_queue, (sheet_info, sheet_result['sheet_data']), writer):
+                        raise RuntimeError("Storage writer stopped unexpectedly")
+            finally:
+                # Sentinel: no more sheets, let the writer drain and exit
+                self._put_while_alive(store_queue, None, writer)
+                writer.join()
+            
+            # One directory fsync for the whole batch of sheet writes
+            self.storage.flush_sheets_dir()
             
-            sync_result['total_sheets'] = sync_result['successful_sheets'] + sync_result['failed_sheets']
+            sync_result['total_sheets'] = (
+                sync_result['successful_sheets'] + sync_result['failed_sheets'] + sync_result['unchanged_sheets']
+            )
             sync_result['sheet_results'] = sheet_results
             sync_result['status'] = 'completed'
             
@@ -83,7 +109,7 @@ class SyncManager:
             # Save sync history
             self.storage.save_sync_history(sync_result)
             
-            logger.info(f"Full sync completed. Success: {sync_result['successful_sheets']}, Failed: {sync_result['failed_sheets']}, Duration: {sync_result['duration_seconds']}s")
+            logger.info("Full sync completed. Success: %s, Failed: %s, Unchanged: %s, Duration: %ss", sync_result['successful_sheets'], sync_result['failed_sheets'], sync_result['unchanged_sheets'], sync_result['duration_seconds'])
             
         except Exception as e:
             error_msg = f"Full sync failed: {e}"
@@ -98,14 +124,113 @@ class SyncManager:
             
         return sync_result
     
+    def _put_while_alive(self, store_queue: queue.Queue, item: Any, writer: threading.Thread) -> bool:
+        """Put item on the store queue, giving up (False) if the writer thread has died"""
+        while writer.is_alive():
+            try:
+                store_queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _store_worker(self, store_queue: queue.Queue, sync_result: Dict[str, Any], sheet_results: List[Dict[str, Any]], results_lock: threading.Lock) -> None:
+        """Save queued (sheet_info, sheet_data) pairs until the None sentinel arrives
+        
+        With SAVE_PROCESSES set, large sheets are encoded and written in a
+        process pool; the worker waits for those saves before returning.
+        Any per-sheet error is recorded as a failed sheet so the queue keeps
+        draining and the producer never blocks on a dead writer.
+        """
+        save_pool = None
+        if Config.SAVE_PROCESSES:
+            # Imported here so commands that never sync don't pay for them
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            
+            try:
+                # Fetch threads and the log listener are running, so forking
+                # here is unsafe; start workers from a clean process instead
+                save_pool = ProcessPoolExecutor(
+                    max_workers=Config.SAVE_PROCESSES,
+                    mp_context=multiprocessing.get_context(
+                        'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                    )
+                )
+            except Exception as e:
+                logger.error("Could not start save process pool, saving inline: %s", e)
+        
+        pending = []
+        try:
+            while True:
+                item = store_queue.get()
+                if item is None:
+                    break
+                
+                sheet_info, sheet_data = item
+                row_count = None
+                try:
+                    row_count = sheet_data['metadata']['total_row_count']
+                    if save_pool is not None and len(sheet_data['rows']) >= Config.SAVE_PROCESS_MIN_ROWS:
+                        future = self.storage.submit_sheet_save(save_pool, sheet_info['id'], sheet_data)
+                        pending.append((sheet_info, row_count, future))
+                        continue
+                    
+                    # Save sheet data
+                    self.storage.save_sheet_data(sheet_info['id'], sheet_data)
+                    error = None
+                except Exception as e:
+                    error = e
+                self._record_save(sheet_info, row_count, error, sync_result, sheet_results, results_lock)
+            
+            for sheet_info, row_count, future in pending:
+                try:
+                    error = future.exception()
+                except Exception as e:
+                    error = e
+                self._record_save(sheet_info, row_count, error, sync_result, sheet_results, results_lock)
+        finally:
+            if save_pool is not None:
+                save_pool.shutdown()
+    
+    def _record_save(self, sheet_info: Dict[str, Any], row_count: Optional[int], error: Optional[BaseException], sync_result: Dict[str, Any], sheet_results: List[Dict[str, Any]], results_lock: threading.Lock) -> None:
+        """Count one saved (or failed) sheet in the sync result"""
+        if error is None:
+            with results_lock:
+                sync_result['successful_sheets'] += 1
+                sheet_results.append({
+                    'sheet_id': sheet_info['id'],
+                    'sheet_name': sheet_info['name'],
+                    'status': 'success',
+                    'row_count': row_count
+                })
+            
+            logger.info("Successfully synced sheet: %s", sheet_info['name'])
+            return
+        
+        error_msg = f"Failed to save sheet {sheet_info['name']}: {error}"
+        logger.error(error_msg)
+        
+        with results_lock:
+            sync_result['failed_sheets'] += 1
+            sync_result['errors'].append(error_msg)
+            sheet_results.append({
+                'sheet_id': sheet_info['id'],
+                'sheet_name': sheet_info['name'],
+                'status': 'failed',
+                'error': str(error)
+            })
+    
     def sync_specific_sheets(self, sheet_ids: List[int]) -> Dict[str, Any]:
         """Sync only specific sheets by their IDs"""
         start_time = time.time()
-        logger.info(f"Starting sync for specific sheets: {sheet_ids}")
+        # One formatted timestamp per sync, shared by the result and every sheet
+        start_iso = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))
+        logger.info("Starting sync for specific sheets: %s", sheet_ids)
         
         sync_result = {
             'sync_type': 'selective',
-            'start_time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'start_time': start_iso,
             'requested_sheets': sheet_ids,
             'successful_sheets': 0,
             'failed_sheets': 0,
@@ -119,7 +244,7 @@ class SyncManager:
             
             for sheet_id in sheet_ids:
                 try:
-                    sheet_data = self.smartsheet_client.get_sheet_data(sheet_id)
+                    sheet_data = self.smartsheet_client.get_sheet_data(sheet_id, sync_time=start_iso)
                     self.storage.save_sheet_data(sheet_id, sheet_data)
                     sync_result['successful_sheets'] += 1
                     
@@ -130,7 +255,7 @@ class SyncManager:
                         'row_count': sheet_data['metadata']['total_row_count']
                     })
                     
-                    logger.info(f"Successfully synced sheet ID {sheet_id}")
+                    logger.info("Successfully synced sheet ID %s", sheet_id)
                     
                 except Exception as e:
                     error_msg = f"Failed to sync sheet {sheet_id}: {e}"
@@ -144,6 +269,8 @@ class SyncManager:
                         'error': str(e)
                     })
             
+            self.storage.flush_sheets_dir()
+            
             sync_result['sheet_results'] = sheet_results
             sync_result['status'] = 'completed'
             
@@ -154,7 +281,7 @@ class SyncManager:
             # Save sync history
             self.storage.save_sync_history(sync_result)
             
-            logger.info(f"Selective sync completed. Success: {sync_result['successful_sheets']}, Failed: {sync_result['failed_sheets']}")
+            logger.info("Selective sync completed. Success: %s, Failed: %s", sync_result['successful_sheets'], sync_result['failed_sheets'])
             
         except Exception as e:
             error_msg = f"Selective sync failed: {e}"
@@ -191,7 +318,7 @@ class SyncManager:
             return status
             
         except Exception as e:
-            logger.error(f"Error getting status: {e}")
+            logger.error("Error getting status: %s", e)
             return {'error': str(e)}
     
     def validate_connection(self) -> Dict[str, Any]:
@@ -218,7 +345,7 @@ class SyncManager:
     def cleanup_old_data(self, keep_latest: int = 10) -> Dict[str, Any]:
         """Clean up old data files"""
         try:
-            logger.info(f"Cleaning up old data, keeping latest {keep_latest} files")
+            logger.info("Cleaning up old data, keeping latest %s files", keep_latest)
             self.storage.cleanup_old_files(keep_latest)
             
             return {
@@ -0,0 +1,33 @@
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+HAS_ORJSON = orjson is not None
+
+def dumps(data: Any, pretty: bool = True) -> bytes:
+    """Serialize data to UTF-8 JSON bytes, indented unless pretty is False"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def dumps_line(record: Dict[str, Any]) -> bytes:
+    """Serialize one record as a compact JSON Lines entry"""
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS) + b'\n'
+    # Sync records are control data; the default ASCII encoder is the fast path
+    return json.dumps(record, separators=(',', ':')).encode('ascii') + b'\n'
+
+def loads(raw: bytes) -> Any:
+    """Parse UTF-8 JSON bytes (orjson also accepts a memoryview)"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
@@ -1,8 +1,70 @@
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 from config.settings import Config
 
+# Records buffered before the log file is written (WARNING+ flushes immediately)
+LOG_BUFFER_CAPACITY = 100
+
+class FastFormatter(logging.Formatter):
+    """Formatter that reuses the formatted timestamp for records in the same second"""
+    
+    # (second, formatted string) swapped as one tuple so threads never see a torn pair
+    _cached_time = (None, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: str = None) -> str:
+        second = int(record.created)
+        cached_second, formatted = self._cached_time
+        if second != cached_second:
+            formatted = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            self._cached_time = (second, formatted)
+        return formatted
+
+# Resolved once at import; every logger shares the same formatter and level
+LOG_FORMATTER = FastFormatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+LOG_LEVEL = getattr(logging, Config.LOG_LEVEL.upper())
+
+# Shared by every logger: records are queued here and written to the log
+# file by a single QueueListener thread
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener: logging.handlers.QueueListener = None
+_listener_lock = threading.Lock()
+
+def _start_file_listener() -> None:
+    """Start the background thread that drains _log_queue into the log file"""
+    global _listener
+    
+    with _listener_lock:
+        if _listener is not None:
+            return
+        
+        # delay=True: the file is only opened once a buffered record is flushed
+        file_handler = logging.FileHandler(Config.LOG_FILE, delay=True)
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(LOG_FORMATTER)
+        memory_handler = logging.handlers.MemoryHandler(
+            LOG_BUFFER_CAPACITY,
+            flushLevel=logging.WARNING,
+            target=file_handler
+        )
+        memory_handler.setLevel(logging.DEBUG)
+        
+        _listener = logging.handlers.QueueListener(
+            _log_queue, memory_handler, respect_handler_level=True
+        )
+        _listener.start()
+        atexit.register(_listener.stop)
+
+@functools.cache
 def setup_logger(name: str = __name__) -> logging.Logger:
     """Setup logger with file and console handlers"""
     logger = logging.getLogger(name)
@@ -10,22 +72,16 @@ def setup_logger(name: str = __name__) -> logging.Logger:
     if logger.handlers:
         return logger
     
-    logger.setLevel(getattr(logging, Config.LOG_LEVEL.upper()))
-    
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    logger.setLevel(LOG_LEVEL)
     
+    # Console output stays synchronous so it keeps its order relative to print()
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(LOG_FORMATTER)
     logger.addHandler(console_handler)
     
     if Config.LOG_FILE:
-        file_handler = logging.FileHandler(Config.LOG_FILE)
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        _start_file_listener()
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
     
-    return logger
\ No newline at end of file
+    return logger